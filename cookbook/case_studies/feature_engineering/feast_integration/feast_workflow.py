@@ -32,8 +32,11 @@ Here's the step-by-step process:
 #   .. code-block::
 #
 #       from feature_eng_tasks import mean_median_imputer, univariate_selection
+#
+# ``scikit-learn`` is imported inside the tasks that use it, here and in the feature engineering tasks, so it's only loaded when those tasks run.
 import logging
 import os
+import typing
 from datetime import datetime, timedelta
 
 import boto3
@@ -41,6 +44,8 @@ import flytekit
 import joblib
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from feast import Entity, FeatureStore, FeatureView, Field, FileSource
 from feast.infra.offline_stores.file import FileOfflineStoreConfig
 from feast.infra.online_stores.sqlite import SqliteOnlineStoreConfig
@@ -50,8 +55,6 @@ from flytekit import FlyteContext, Resources, task, workflow
 from flytekit.extras.sqlite3.task import SQLite3Config, SQLite3Task
 from flytekit.types.file import FlyteFile, JoblibSerializedFile
 from flytekit.types.structured import StructuredDataset
-from sklearn.model_selection import train_test_split
-from sklearn.naive_bayes import GaussianNB
 
 from .feature_eng_tasks import mean_median_imputer, univariate_selection
 
@@ -120,6 +123,19 @@ def create_bucket(
     )
 
 
+# %%
+# Building a ``FeatureStore`` parses the registry, which is fetched from S3, so reuse the store built for the same
+# registry and online store whenever several tasks run in the same process, e.g., when executing the workflow locally.
+_FEATURE_STORES = {}
+
+
+def _build_feature_store(repo_config: RepoConfig) -> FeatureStore:
+    key = (str(repo_config.registry), repo_config.online_store.path)
+    if key not in _FEATURE_STORES:
+        _FEATURE_STORES[key] = FeatureStore(config=repo_config)
+    return _FEATURE_STORES[key]
+
+
 # %%
 # Define a ``SQLite3Task`` that fetches data from a data source for feature ingestion.
 load_horse_colic_sql = SQLite3Task(
@@ -134,13 +150,19 @@ load_horse_colic_sql = SQLite3Task(
 
 
 # %%
-# Set the datatype of the timestamp column in the underlying DataFrane to ``datetime``, which would otherwise be a string.
+# Set the datatype of the timestamp column in the underlying dataset to ``timestamp``, which would otherwise be a string.
+# The dataset is read as an Arrow table, so the column is parsed in Arrow without converting the whole table to Pandas.
 @task
-def convert_timestamp_column(
-    dataframe: pd.DataFrame, timestamp_column: str
-) -> pd.DataFrame:
-    dataframe[timestamp_column] = pd.to_datetime(dataframe[timestamp_column])
-    return dataframe
+def convert_timestamp_column(dataframe: pa.Table, timestamp_column: str) -> pa.Table:
+    column_index = dataframe.schema.get_field_index(timestamp_column)
+    # nothing to parse if the column already holds timestamps
+    if pa.types.is_timestamp(dataframe.schema.field(column_index).type):
+        return dataframe
+    return dataframe.set_column(
+        column_index,
+        timestamp_column,
+        pc.strptime(dataframe[timestamp_column], format="%Y-%m-%d %H:%M:%S", unit="us"),
+    )
 
 
 # %%
@@ -166,8 +188,13 @@ def convert_timestamp_column(
 #
 #   The Feast feature store is mutable, so be careful, as Flyte workflows can be highly concurrent!
 #   TODO: use postgres db as the registry to support concurrent writes.
+#
+# The ``ttl`` of the feature view bounds how far back the point-in-time join looks for feature values, so keep it
+# close to the refresh cadence of the data; a wide window makes ``get_historical_features()`` scan far more rows.
 @task(limits=Resources(mem="400Mi"))
-def store_offline(repo_config: RepoConfig, dataframe: StructuredDataset) -> FlyteFile:
+def store_offline(
+    repo_config: RepoConfig, dataframe: StructuredDataset, ttl: timedelta
+) -> FlyteFile:
     horse_colic_entity = Entity(name="Hospital Number")
 
     ctx = flytekit.current_context()
@@ -198,11 +225,11 @@ def store_offline(repo_config: RepoConfig, dataframe: StructuredDataset) -> Flyt
             timestamp_field="timestamp",
             s3_endpoint_override=ENDPOINT,
         ),
-        ttl=timedelta(days=1),
+        ttl=ttl,
     )
 
     # ingest the data into Feast
-    FeatureStore(config=repo_config).apply(
+    _build_feature_store(repo_config).apply(
         [horse_colic_entity, horse_colic_feature_view]
     )
 
@@ -237,9 +264,11 @@ def load_historical_features(repo_config: RepoConfig) -> pd.DataFrame:
             ],
         }
     )
+    # a categorical entity key keeps the point-in-time join off the slow ``object`` dtype path
+    entity_df["Hospital Number"] = entity_df["Hospital Number"].astype("category")
 
     historical_features = (
-        FeatureStore(config=repo_config)
+        _build_feature_store(repo_config)
         .get_historical_features(entity_df=entity_df, features=FEAST_FEATURES)
         .to_df()
     )  # noqa
@@ -251,6 +280,9 @@ def load_historical_features(repo_config: RepoConfig) -> pd.DataFrame:
 # Train a Naive Bayes model by fetching features from the offline store and the corresponding data from the parquet file.
 @task
 def train_model(dataset: pd.DataFrame, data_class: str) -> JoblibSerializedFile:
+    from sklearn.model_selection import train_test_split
+    from sklearn.naive_bayes import GaussianNB
+
     x_train, _, y_train, _ = train_test_split(
         dataset[dataset.columns[~dataset.columns.isin([data_class])]],
         dataset[data_class],
@@ -258,8 +290,8 @@ def train_model(dataset: pd.DataFrame, data_class: str) -> JoblibSerializedFile:
         random_state=42,
     )
     model = GaussianNB()
-    model.fit(x_train.values, y_train.values)
-    model.feature_names = list(x_train.columns.values)
+    # fitting on the DataFrame records the feature names in ``model.feature_names_in_``
+    model.fit(x_train, y_train.values)
     fname = "/tmp/model.joblib.dat"
     joblib.dump(model, fname)
     return fname
@@ -289,25 +321,28 @@ def store_online(repo_config: RepoConfig, online_store: FlyteFile) -> FlyteFile:
         online_store.download(), repo_config.online_store.path
     )
 
-    FeatureStore(config=repo_config).materialize(
-        start_date=datetime.utcnow() - timedelta(days=2000),
-        end_date=datetime.utcnow() - timedelta(minutes=10),
+    # take a single reference time so that the materialization window is consistent
+    now = datetime.utcnow()
+    _build_feature_store(repo_config).materialize(
+        start_date=now - timedelta(days=2000),
+        end_date=now - timedelta(minutes=10),
     )
 
     return FlyteFile(path=repo_config.online_store.path)
 
 
 # %%
-# Retrieve a feature vector from the online store.
+# Retrieve the feature vectors of one or more entities from the online store.
+# All entity rows are fetched with a single ``get_online_features()`` call, which the online store serves as one batched read.
 @task
 def retrieve_online(
     repo_config: RepoConfig,
     online_store: FlyteFile,
-    data_point: int,
+    data_points: typing.List[int],
 ) -> dict:
-    # retrieve a data point
-    logger.info(f"Hospital Number chosen for inference is: {data_point}")
-    entity_rows = [{"Hospital Number": data_point}]
+    # retrieve the data points
+    logger.info(f"Hospital Numbers chosen for inference are: {data_points}")
+    entity_rows = [{"Hospital Number": data_point} for data_point in data_points]
 
     # download the online store file and copy the content to the actual online store path
     FlyteContext.current_context().file_access.get_data(
@@ -316,7 +351,7 @@ def retrieve_online(
 
     # get the feature vector
     feature_vector = (
-        FeatureStore(config=repo_config)
+        _build_feature_store(repo_config)
         .get_online_features(FEAST_FEATURES, entity_rows)
         .to_dict()
     )
@@ -328,14 +363,19 @@ def retrieve_online(
 @task
 def predict(model_ser: JoblibSerializedFile, features: dict) -> np.ndarray:
     model = joblib.load(model_ser)
-    f_names = model.feature_names
+    f_names = model.feature_names_in_
 
-    test_list = []
-    for each_name in f_names:
-        test_list.append(features[each_name][0])
+    # gather the feature values into a single float row; missing values become NaN
+    test_row = np.fromiter(
+        (features[each_name][0] for each_name in f_names),
+        dtype=np.float64,
+        count=len(f_names),
+    )
 
-    if all(test_list):
-        prediction = model.predict([[float(x) for x in test_list]])
+    if not np.isnan(test_row).any():
+        prediction = model.predict(
+            pd.DataFrame(test_row.reshape(1, -1), columns=f_names)
+        )
     else:
         prediction = ["The requested data is not found in the online feature store"]
     return prediction
@@ -345,7 +385,9 @@ def predict(model_ser: JoblibSerializedFile, features: dict) -> np.ndarray:
 # Define a workflow that loads the data from SQLite3 database, does feature engineering, and stores the offline features in a feature store.
 @workflow
 def featurize(
-    repo_config: RepoConfig, imputation_method: str = "mean"
+    repo_config: RepoConfig,
+    imputation_method: str = "mean",
+    feature_ttl: timedelta = timedelta(minutes=10),
 ) -> (StructuredDataset, FlyteFile):
     # load parquet file from sqlite task
     df = load_horse_colic_sql()
@@ -359,6 +401,7 @@ def featurize(
     online_store = store_offline(
         repo_config=repo_config,
         dataframe=converted_df,
+        ttl=feature_ttl,
     )
 
     return df, online_store
@@ -395,6 +438,7 @@ def feast_workflow(
     online_store_path: str = "online.db",
     imputation_method: str = "mean",
     num_features_univariate: int = 7,
+    feature_ttl: timedelta = timedelta(minutes=10),
 ) -> (JoblibSerializedFile, np.ndarray):
     repo_config = create_bucket(
         bucket_name=s3_bucket,
@@ -406,6 +450,7 @@ def feast_workflow(
     df, online_store = featurize(
         repo_config=repo_config,
         imputation_method=imputation_method,
+        feature_ttl=feature_ttl,
     )
 
     # load features from the offline store
@@ -429,7 +474,7 @@ def feast_workflow(
     feature_vector = retrieve_online(
         repo_config=repo_config,
         online_store=loaded_online_store,
-        data_point=533738,
+        data_points=[533738],
     )
 
     # generate a prediction
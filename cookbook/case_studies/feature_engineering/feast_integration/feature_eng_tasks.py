@@ -11,8 +11,6 @@ import numpy as np
 import pandas as pd
 from flytekit import task
 from numpy.core.fromnumeric import sort
-from sklearn.feature_selection import SelectKBest, f_classif
-from sklearn.impute import SimpleImputer
 
 # %%
 # There are a specific set of columns for which imputation isn't required. Ignore them.
@@ -33,6 +31,8 @@ def mean_median_imputer(
     dataframe: pd.DataFrame,
     imputation_method: str,
 ) -> pd.DataFrame:
+    from sklearn.impute import SimpleImputer
+
     dataframe = dataframe.replace("?", np.nan)
     if imputation_method not in ["median", "mean"]:
         raise ValueError("imputation_method takes only values 'median' or 'mean'")
@@ -57,6 +57,8 @@ def mean_median_imputer(
 def univariate_selection(
     dataframe: pd.DataFrame, num_features: int, data_class: str
 ) -> pd.DataFrame:
+    from sklearn.feature_selection import SelectKBest, f_classif
+
     # remove ``timestamp`` and ``Hospital Number`` columns as they ought to be present in the dataset
     dataframe = dataframe.drop(["event_timestamp", "Hospital Number"], axis=1)
 
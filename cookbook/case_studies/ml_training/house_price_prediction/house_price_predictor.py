@@ -28,7 +28,6 @@ Let's get started with the example!
 # .. code-block:: python
 #
 #       pip install scikit-learn
-#       pip install joblib
 #       pip install xgboost
 
 import os
@@ -39,13 +38,10 @@ import typing
 from typing import Tuple
 
 import flytekit
-import joblib
 import numpy as np
 import pandas as pd
 from flytekit import Resources, task, workflow
-from flytekit.types.file import JoblibSerializedFile
-from sklearn.model_selection import train_test_split
-from xgboost import XGBRegressor
+from flytekit.types.file import FlyteFile
 
 # %%
 # We initialize a variable to represent columns in the dataset. The other variables help generate the dataset.
@@ -60,6 +56,8 @@ COLUMNS = [
     "GARAGE_SPACES",
 ]
 MAX_YEAR = 2021
+# the trained model is saved in XGBoost's native JSON model format.
+MODELSER_XGB = typing.TypeVar("json")
 # divide the data into train, validation, and test datasets in specific ratio.
 SPLIT_RATIOS = [0.6, 0.3, 0.1]
 
@@ -70,48 +68,38 @@ SPLIT_RATIOS = [0.6, 0.3, 0.1]
 # We define a function to compute the price of a house based on multiple factors (``number of bedrooms``, ``number of bathrooms``, ``area``, ``garage space``, and ``year built``).
 
 
-def gen_price(house) -> int:
-    _base_price = int(house["SQUARE_FEET"] * 150)
-    _price = int(
+def gen_price(house) -> np.ndarray:
+    _base_price = (house["SQUARE_FEET"] * 150).astype(np.int64)
+    _price = (
         _base_price
         + (10000 * house["NUM_BEDROOMS"])
         + (15000 * house["NUM_BATHROOMS"])
         + (15000 * house["LOT_ACRES"])
         + (15000 * house["GARAGE_SPACES"])
         - (5000 * (MAX_YEAR - house["YEAR_BUILT"]))
-    )
+    ).astype(np.int64)
     return _price
 
 
 # %%
 # Next, using the above function, we generate a DataFrame object that constitutes all the house details.
+# Every column is sampled in one go as a NumPy array, so no per-house Python loop is needed.
 def gen_houses(num_houses) -> pd.DataFrame:
-    _house_list = []
-    for _ in range(num_houses):
-        _house = {
-            "SQUARE_FEET": int(np.random.normal(3000, 750)),
-            "NUM_BEDROOMS": np.random.randint(2, 7),
-            "NUM_BATHROOMS": np.random.randint(2, 7) / 2,
-            "LOT_ACRES": round(np.random.normal(1.0, 0.25), 2),
-            "GARAGE_SPACES": np.random.randint(0, 4),
-            "YEAR_BUILT": min(MAX_YEAR, int(np.random.normal(1995, 10))),
-        }
-        _price = gen_price(_house)
-        # column names/features
-        _house_list.append(
-            [
-                _price,
-                _house["YEAR_BUILT"],
-                _house["SQUARE_FEET"],
-                _house["NUM_BEDROOMS"],
-                _house["NUM_BATHROOMS"],
-                _house["LOT_ACRES"],
-                _house["GARAGE_SPACES"],
-            ]
-        )
-    # convert the list to a DataFrame
+    rng = np.random.default_rng()
+    _houses = {
+        "SQUARE_FEET": rng.normal(3000, 750, num_houses).astype(np.int32),
+        "NUM_BEDROOMS": rng.integers(2, 7, num_houses),
+        "NUM_BATHROOMS": rng.integers(2, 7, num_houses) / 2,
+        "LOT_ACRES": np.round(rng.normal(1.0, 0.25, num_houses), 2),
+        "GARAGE_SPACES": rng.integers(0, 4, num_houses),
+        "YEAR_BUILT": np.minimum(
+            MAX_YEAR, rng.normal(1995, 10, num_houses).astype(np.int32)
+        ),
+    }
+    _houses["PRICE"] = gen_price(_houses)
+    # build the DataFrame from the column arrays, in the order of the column names/features
     _df = pd.DataFrame(
-        _house_list,
+        _houses,
         columns=COLUMNS,
     )
     return _df
@@ -122,6 +110,17 @@ def gen_houses(num_houses) -> pd.DataFrame:
 # ===================================
 #
 # We split the data into train, test, and validation subsets.
+# Each subset is assembled column by column, placing `target` as the first column and `features` in the subsequent columns,
+# so the feature and target arrays never have to be concatenated into a new matrix.
+def _to_df(x: np.ndarray, y: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            COLUMNS[0]: y.ravel(),
+            **{column: x[:, i] for i, column in enumerate(COLUMNS[1:])},
+        }
+    )
+
+
 def split_data(
     df: pd.DataFrame, seed: int, split: typing.List[float]
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
@@ -131,47 +130,42 @@ def split_data(
     test_size = split[2]  # 0.1
 
     num_samples = df.shape[0]
+    # XGBoost works on float32 internally, so convert the data once and move half the bytes of float64
+    values = df.to_numpy(dtype=np.float32)
     # retain the features, skip the target column
-    x1 = df.values[:num_samples, 1:]
+    x1 = values[:, 1:]
     # retain the target column
-    y1 = df.values[:num_samples, :1]
-
-    # divide the features and target column into random train and test subsets, based on `test_size`
-    x_train, x_test, y_train, y_test = train_test_split(
-        x1, y1, test_size=test_size, random_state=seed
-    )
-    # divide the train data into train and validation subsets, based on `test_size`
-    x_train, x_val, y_train, y_val = train_test_split(
-        x_train,
-        y_train,
-        test_size=(val_size / (1 - test_size)),  # here, `test_size` computes to 0.3
-        random_state=seed,
-    )
-
-    # reassemble the datasets by placing `target` as first column and `features` in the subsequent columns
-    _train = np.concatenate([y_train, x_train], axis=1)
-    _val = np.concatenate([y_val, x_val], axis=1)
-    _test = np.concatenate([y_test, x_test], axis=1)
+    y1 = values[:, :1]
+
+    # shuffle the row indices once and slice them into test, validation, and train subsets
+    indices = np.random.default_rng(seed).permutation(num_samples)
+    num_test = int(np.ceil(num_samples * test_size))
+    # here, the validation fraction of the remaining rows computes to 0.3 / 0.9
+    num_val = int(np.ceil((num_samples - num_test) * val_size / (1 - test_size)))
+    test_idx = indices[:num_test]
+    val_idx = indices[num_test : num_test + num_val]
+    train_idx = indices[num_test + num_val :]
+    if len(train_idx) == 0:
+        raise ValueError(
+            f"With {num_samples} samples and split ratios {split}, "
+            "the resulting train set would be empty; generate more houses."
+        )
 
     # return three DataFrames with train, test, and validation data
     return (
-        pd.DataFrame(
-            _train,
-            columns=COLUMNS,
-        ),
-        pd.DataFrame(
-            _val,
-            columns=COLUMNS,
-        ),
-        pd.DataFrame(
-            _test,
-            columns=COLUMNS,
-        ),
+        _to_df(x1[train_idx], y1[train_idx]),
+        _to_df(x1[val_idx], y1[val_idx]),
+        _to_df(x1[test_idx], y1[test_idx]),
     )
 
 
 # %%
 # Next, we create a ``NamedTuple`` to map a variable name to its respective data type.
+#
+# .. note::
+#
+#   Flyte passes ``pandas.DataFrame`` outputs between tasks as a :py:class:`~flytekit:flytekit.types.structured.StructuredDataset`,
+#   which is written as a columnar Parquet file (through Arrow) rather than CSV or pickle, so no manual serialization is needed here.
 dataset = typing.NamedTuple(
     "GenerateSplitDataOutputs",
     train_data=pd.DataFrame,
@@ -183,7 +177,7 @@ dataset = typing.NamedTuple(
 # We define a task to call the aforementioned functions.
 
 
-@task(cache=True, cache_version="0.1", limits=Resources(mem="600Mi"))
+@task(cache=True, cache_version="0.3", limits=Resources(mem="600Mi"))
 def generate_and_split_data(number_of_houses: int, seed: int) -> dataset:
     _houses = gen_houses(number_of_houses)
     return split_data(_houses, seed, split=SPLIT_RATIOS)
@@ -193,59 +187,72 @@ def generate_and_split_data(number_of_houses: int, seed: int) -> dataset:
 # Training
 # ==========
 #
-# We fit an ``XGBRegressor`` model on our data, serialize the model using `joblib`, and return a :py:obj:`~flytekit:flytekit.types.file.JoblibSerializedFile`.
-@task(cache_version="1.0", cache=True, limits=Resources(mem="600Mi"))
-def fit(loc: str, train: pd.DataFrame, val: pd.DataFrame) -> JoblibSerializedFile:
+# We fit an ``XGBRegressor`` model on our data, save the model using XGBoost's native ``save_model``, and return a :py:class:`~flytekit:flytekit.types.file.FlyteFile`.
+# Unlike pickling the estimator with `joblib`, the native format only stores the trees and is portable across Python and XGBoost versions.
+@task(cache_version="2.1", cache=True, limits=Resources(mem="600Mi"))
+def fit(loc: str, train: pd.DataFrame, val: pd.DataFrame) -> FlyteFile[MODELSER_XGB]:
+    from xgboost import XGBRegressor
 
     # fetch the features and target columns from the train dataset
-    x = train[train.columns[1:]]
-    y = train[train.columns[0]]
+    x = train.iloc[:, 1:]
+    y = train.iloc[:, 0]
 
     # fetch the features and target columns from the validation dataset
-    eval_x = val[val.columns[1:]]
-    eval_y = val[val.columns[0]]
+    eval_x = val.iloc[:, 1:]
+    eval_y = val.iloc[:, 0]
 
-    m = XGBRegressor()
-    # fit the model to the train data
-    m.fit(x, y, eval_set=[(eval_x, eval_y)])
+    # histogram-based split finding on all available cores is much faster than the exact greedy algorithm
+    m = XGBRegressor(tree_method="hist", n_jobs=-1, n_estimators=100, max_bin=256)
+    # fit the model to the train data, stopping once the validation score stops improving
+    m.fit(x, y, eval_set=[(eval_x, eval_y)], early_stopping_rounds=20)
 
     working_dir = flytekit.current_context().working_directory
-    fname = os.path.join(working_dir, f"model-{loc}.joblib.dat")
-    joblib.dump(m, fname)
+    fname = os.path.join(working_dir, f"model-{loc}.json")
+    m.save_model(fname)
 
     # return the serialized model
-    return JoblibSerializedFile(path=fname)
+    return FlyteFile(path=fname)
 
 
 # %%
 # Generating Predictions
 # ========================
 #
-# Next, we unserialize the XGBoost model using `joblib` to generate the predictions.
-@task(cache_version="1.0", cache=True, limits=Resources(mem="600Mi"))
+# Next, we load the XGBoost model with ``load_model`` to generate the predictions.
+# The booster's ``inplace_predict`` reads the float32 feature matrix directly instead of building a ``DMatrix`` first.
+@task(cache_version="2.1", cache=True, limits=Resources(mem="600Mi"))
 def predict(
     test: pd.DataFrame,
-    model_ser: JoblibSerializedFile,
+    model_ser: FlyteFile[MODELSER_XGB],
 ) -> typing.List[float]:
+    from xgboost import XGBRegressor
 
     # load the model
-    model = joblib.load(model_ser)
+    model = XGBRegressor()
+    model.load_model(model_ser.download())
 
     # load the test data
-    x_df = test[test.columns[1:]]
+    x = test.iloc[:, 1:].to_numpy(dtype=np.float32)
 
-    # generate predictions
-    y_pred = model.predict(x_df).tolist()
+    # generate predictions with the trees up to the best iteration found by early stopping
+    y_pred = (
+        model.get_booster()
+        .inplace_predict(x, iteration_range=(0, model.best_iteration + 1))
+        .tolist()
+    )
 
     # return the predictions
     return y_pred
 
 
 # %%
-# Lastly, we define a workflow to run the pipeline.
+# Lastly, we define a workflow to run the pipeline for a single location.
+# To train models for several locations in parallel, see the :ref:`multi-region example <Predicting House Price in Multiple Regions Using XGBoost and Dynamic Workflows>`.
 @workflow
 def house_price_predictor_trainer(
-    seed: int = 7, number_of_houses: int = NUM_HOUSES_PER_LOCATION
+    seed: int = 7,
+    number_of_houses: int = NUM_HOUSES_PER_LOCATION,
+    loc: str = "NewYork_NY",
 ) -> typing.List[float]:
 
     # generate the data and split it into train test, and validation data
@@ -254,9 +261,7 @@ def house_price_predictor_trainer(
     )
 
     # fit the XGBoost model
-    model = fit(
-        loc="NewYork_NY", train=split_data_vals.train_data, val=split_data_vals.val_data
-    )
+    model = fit(loc=loc, train=split_data_vals.train_data, val=split_data_vals.val_data)
 
     # generate predictions
     predictions = predict(model_ser=model, test=split_data_vals.test_data)